@@ -30,6 +30,8 @@
 //!
 //! If you start to enter an invalid number, just press ENTER to submit it, and let the parser fail.
 //!
+//! You may send multiple throttle commands back-to-back, like `A.37\rB.42\r`.
+//!
 //! To read back the throttle for all outputs, send 'r' (lower case 'R').
 //!
 //! Press the SPACE bar to reset all throttles to 0%. Use this in case of emergency...
@@ -95,8 +95,10 @@ impl<R: Read> Parser<R> {
         self.bytes_read += bytes_read;
         match parse(&self.buffer[..self.bytes_read]) {
             Ok(None) => Ok(None),
-            Ok(Some(command)) => {
-                self.bytes_read = 0;
+            Ok(Some((command, consumed))) => {
+                // Keep any commands that follow this one for the next call
+                self.buffer.copy_within(consumed..self.bytes_read, 0);
+                self.bytes_read -= consumed;
                 Ok(Some(command))
             }
             Err(err) => {
@@ -107,7 +109,11 @@ impl<R: Read> Parser<R> {
     }
 }
 
-fn parse(buffer: &[u8]) -> Result<Option<Command>, ParserError> {
+/// Parse the first command in the buffer
+///
+/// On success, returns the command and the number of bytes that it used. The
+/// buffer may hold more commands after those bytes.
+fn parse(buffer: &[u8]) -> Result<Option<(Command, usize)>, ParserError> {
     // Match a valid output immediately
     let output = if let Some(output) = buffer.get(0) {
         match *output {
@@ -115,9 +121,9 @@ fn parse(buffer: &[u8]) -> Result<Option<Command>, ParserError> {
             b'B' => QuadMotor::B,
             b'C' => QuadMotor::C,
             b'D' => QuadMotor::D,
-            b'r' => return Ok(Some(Command::ReadSettings)),
-            b' ' => return Ok(Some(Command::ResetThrottle)),
-            b'\\' => return Ok(Some(Command::KillSwitch)),
+            b'r' => return Ok(Some((Command::ReadSettings, 1))),
+            b' ' => return Ok(Some((Command::ResetThrottle, 1))),
+            b'\\' => return Ok(Some((Command::KillSwitch, 1))),
             _ => return Err(ParserError::InvalidPrefix(*output as char)),
         }
     } else {
@@ -135,19 +141,15 @@ fn parse(buffer: &[u8]) -> Result<Option<Command>, ParserError> {
     }
 
     // Now, we wait for the end of the string...
-    match buffer.last() {
-        Some(b'\r') => (),
-        _ => return Ok(None),
-    }
-
-    let pct_str = str::from_utf8(&buffer[2..])?;
-    if pct_str.is_empty() {
-        return Ok(None);
-    }
+    let end = match buffer.iter().position(|&byte| byte == b'\r') {
+        Some(end) => end,
+        None => return Ok(None),
+    };
 
+    let pct_str = str::from_utf8(&buffer[2..end])?;
     let percent: f32 = str::parse(pct_str.trim())?;
     if (0.0f32..=100.0f32).contains(&percent) {
-        Ok(Some(Command::SetThrottle { output, percent }))
+        Ok(Some((Command::SetThrottle { output, percent }, end + 1)))
     } else {
         Err(ParserError::InvalidPercentage(percent))
     }
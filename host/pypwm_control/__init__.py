@@ -12,13 +12,20 @@ Use this Python package to
 from .imu_stream import ImuStream, ImuReading
 from .pwm_control import PwmControl
 
-from typing import Tuple
+try:
+    from ._imu_stream import ImuStreamC
+except ImportError:
+    # The optional Cython extension isn't built
+    ImuStreamC = None
 
+from typing import Tuple, Union
 
-def open(port: str, baud=115_2500) -> Tuple[ImuStream, PwmControl]:
+
+def open(port: str, baud=115_2500) -> Tuple[Union[ImuStream, "ImuStreamC"], PwmControl]:
     """Open a serial connection to the embedded system running
     the pwm-control demo. Returns the ImuStream sensor reading
-    object, and the PWM control object.
+    object, and the PWM control object. The ImuStream is an
+    ImuStreamC if the Cython extension is available.
 
     `port` is a COM port on Windows, or a character device on
     *nix.
@@ -31,4 +38,5 @@ def open(port: str, baud=115_2500) -> Tuple[ImuStream, PwmControl]:
     import serial
 
     device = serial.Serial(port, baud)
-    return ImuStream(device), PwmControl(device)
+    imu_stream = (ImuStreamC or ImuStream)(device)
+    return imu_stream, PwmControl(device)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""Numba implementation of the motion_sensor library
+
+ImuStream uses this module when the pymotion-sensor library isn't installed.
+It decodes the same COBS-encoded, postcard-serialized readings as
+motion_sensor.convert_readings, and exposes the same reading types.
+
+Numba caches the compiled decoder next to this module, so only the first
+import pays the compile time.
+"""
+
+import numba
+import numpy as np
+
+
+class _Triplet:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Acc(_Triplet):
+    """Accelerometer readings, units in Gs"""
+
+
+class Gyro(_Triplet):
+    """Gyroscope readings, units in deg/sec"""
+
+
+class Mag(_Triplet):
+    """Magnetometer readings, units in uT"""
+
+
+# Indexed by the motion_sensor::Reading variant
+_READING_TYPES = (Acc, Gyro, Mag)
+
+
+@numba.njit(cache=True)
+def _cobs_decode(frame):
+    """Decode a zero-terminated COBS frame, returning the decoded bytes"""
+    data = np.empty(frame.size, np.uint8)
+    length = 0
+    idx = 0
+    while True:
+        if idx >= frame.size:
+            raise ValueError("error converting readings: missing COBS sentinel")
+        code = frame[idx]
+        idx += 1
+        if code == 0:
+            return data[:length]
+        for _ in range(code - 1):
+            if idx >= frame.size or frame[idx] == 0:
+                raise ValueError("error converting readings: truncated COBS block")
+            data[length] = frame[idx]
+            length += 1
+            idx += 1
+        # Short blocks imply a zero, unless they end the frame
+        if code != 0xFF and idx < frame.size and frame[idx] != 0:
+            data[length] = 0
+            length += 1
+
+
+@numba.njit(cache=True)
+def _varint(data, idx):
+    """Decode a postcard varint at idx, returning the value and the next index"""
+    value = 0
+    shift = 0
+    while True:
+        if idx >= data.size or shift > 28:
+            raise ValueError("error converting readings: invalid varint")
+        byte = data[idx]
+        idx += 1
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80 == 0:
+            return value, idx
+        shift += 7
+
+
+@numba.njit(cache=True)
+def convert_readings_nb(frame):
+    """Decode a uint8 array holding one zero-terminated frame
+
+    Returns a (N, 3) float32 array of x, y, z values, and an (N,) uint8 array
+    of the motion_sensor::Reading variant for each row.
+    """
+    data = _cobs_decode(frame)
+    count, idx = _varint(data, 0)
+    # Each reading has at least a variant byte and three f32s
+    if count * 13 > data.size - idx:
+        raise ValueError("error converting readings: not enough bytes")
+
+    values = np.empty((count, 3), np.float32)
+    kinds = np.empty(count, np.uint8)
+    # A contiguous scratch buffer, so that we can view its bytes as f32s
+    triplet = np.empty(12, np.uint8)
+    for row in range(count):
+        kind, idx = _varint(data, idx)
+        if kind >= 3 or idx + 12 > data.size:
+            raise ValueError("error converting readings: invalid reading")
+        triplet[:] = data[idx : idx + 12]
+        values[row, :] = triplet.view(np.float32)
+        kinds[row] = kind
+        idx += 12
+
+    return values, kinds
+
+
+def convert_readings(buffer):
+    """Converts a raw buffer of one or more readings into a collection of readings
+
+    See motion_sensor.convert_readings. Throws a ValueError if the buffer does
+    not hold valid readings. Unlike motion_sensor, the buffer is not modified.
+    """
+    values, kinds = convert_readings_nb(np.frombuffer(buffer, dtype=np.uint8))
+    return [
+        _READING_TYPES[kind](*value)
+        for kind, value in zip(kinds.tolist(), values.tolist())
+    ]
@@ -0,0 +1,106 @@
+# cython: language_level=3
+
+"""Compiled IMU data stream
+
+An optional Cython implementation of ImuStream. ImuStreamC has the same
+interface as ImuStream, but it searches, decodes, and filters frames without
+the per-reading Python overhead. Build it with the host setup.py script.
+"""
+
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE
+from libc.string cimport memchr
+
+from .imu_stream import (
+    motion_sensor,
+    _READING_BITS,
+    _prime_readings,
+    _start_frame_reader,
+    _stream_arrays,
+)
+
+cdef object _convert_readings = motion_sensor.convert_readings
+cdef object _Acc = motion_sensor.Acc
+cdef object _Gyro = motion_sensor.Gyro
+cdef object _Mag = motion_sensor.Mag
+cdef unsigned int _ACC_BIT = _READING_BITS[_Acc]
+cdef unsigned int _GYRO_BIT = _READING_BITS[_Gyro]
+cdef unsigned int _MAG_BIT = _READING_BITS[_Mag]
+
+
+cdef inline Py_ssize_t _find_zero(bytearray buffer, Py_ssize_t start):
+    """Returns the index of the first zero byte at or after start, or -1"""
+    cdef char *data = PyByteArray_AS_STRING(buffer)
+    cdef char *zero = <char *>memchr(
+        data + start, 0, PyByteArray_GET_SIZE(buffer) - start
+    )
+    if zero == NULL:
+        return -1
+    return zero - data
+
+
+cpdef list _pop_frames(bytearray rxbuf):
+    """Remove and return the complete, zero-terminated frames from rxbuf"""
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t end
+    cdef list frames = []
+
+    end = _find_zero(rxbuf, start)
+    while end != -1:
+        frames.append(rxbuf[start : end + 1])
+        start = end + 1
+        end = _find_zero(rxbuf, start)
+    del rxbuf[:start]
+    return frames
+
+
+cdef class ImuStreamC:
+    """An iterator over the IMU readings
+
+    See ImuStream for usage.
+    """
+
+    cdef object _serial
+    cdef unsigned int _measurement_filter
+
+    def __init__(self, serial):
+        self._serial = serial
+        self._measurement_filter = _ACC_BIT | _GYRO_BIT | _MAG_BIT
+
+    cdef inline bint _is_enabled(self, object reading):
+        cdef object reading_type = type(reading)
+        if reading_type is _Acc:
+            return self._measurement_filter & _ACC_BIT
+        if reading_type is _Gyro:
+            return self._measurement_filter & _GYRO_BIT
+        if reading_type is _Mag:
+            return self._measurement_filter & _MAG_BIT
+        return False
+
+    def disable_readings(self, *reading_types):
+        """See ImuStream.disable_readings"""
+        for reading_type in reading_types:
+            self._measurement_filter &= ~<unsigned int>_READING_BITS[reading_type]
+
+    def enable_readings(self, *reading_types):
+        """See ImuStream.enable_readings"""
+        for reading_type in reading_types:
+            self._measurement_filter |= <unsigned int>_READING_BITS[reading_type]
+
+    def stream(self):
+        """See ImuStream.stream"""
+        rxbuf = _prime_readings(self._serial)
+        frames, stop = _start_frame_reader(self._serial, rxbuf, _pop_frames)
+        try:
+            while True:
+                frame = frames.get()
+                if isinstance(frame, Exception):
+                    raise frame
+                for reading in _convert_readings(frame):
+                    if self._is_enabled(reading):
+                        yield reading
+        finally:
+            stop()
+
+    def stream_arrays(self, batch=256, into=None):
+        """See ImuStream.stream_arrays"""
+        return _stream_arrays(self.stream, batch, into)
@@ -3,9 +3,188 @@
 """IMU data stream
 
 The implementation uses the motion_sensor library to decode IMU readings.
+If motion_sensor isn't installed, it falls back to a Numba decoder.
 """
 
-import motion_sensor
+try:
+    import motion_sensor
+except ImportError as motion_sensor_err:
+    try:
+        from . import _convert_numba as motion_sensor
+    except ImportError:
+        raise ImportError(
+            "pypwm_control needs the pymotion-sensor library, "
+            "or numba and numpy for the fallback decoder"
+        ) from motion_sensor_err
+
+import os
+import queue
+import selectors
+import threading
+import time
+
+# The largest COBS-encoded frame that the embedded system sends
+MAX_FRAME_LEN = 128
+
+# The most bytes to take from the serial device's file descriptor per read
+READ_CHUNK_LEN = 4096
+
+# Seconds that the reader thread waits for data before checking whether the
+# stream has stopped
+READ_TIMEOUT = 0.1
+
+# Seconds between polls of serial devices that don't have a file descriptor
+POLL_INTERVAL = 0.001
+
+# The most frames to hold between the reader thread and the decoder. If the
+# decoder falls behind, the reader thread drops the oldest frames.
+MAX_QUEUED_FRAMES = 256
+
+
+def _serial_reader(serial):
+    """Returns a read(timeout) function that waits up to timeout seconds for
+    the serial device to have data, then returns all of the available bytes,
+    and a close() function that releases the reader's resources
+
+    read() returns no bytes if the timeout expires.
+
+    If the serial device has a file descriptor (pyserial on *nix), read() reads
+    the descriptor directly, skipping pyserial's per-read overhead. Otherwise,
+    it uses the serial device's read().
+    """
+    try:
+        fd = serial.fileno()
+    except (AttributeError, OSError):
+        # No descriptor, like pyserial on Windows
+        return _poll_reader(serial), lambda: None
+
+    selector = selectors.DefaultSelector()
+    selector.register(fd, selectors.EVENT_READ)
+
+    def read(timeout):
+        while True:
+            if not selector.select(timeout):
+                return b""
+            try:
+                data = os.read(fd, READ_CHUNK_LEN)
+            except BlockingIOError:
+                # pyserial opens the port non-blocking, so wakeups may be spurious
+                continue
+            if not data:
+                raise ConnectionError("Serial device is ready, but returned no data")
+            return data
+
+    return read, selector.close
+
+
+def _poll_reader(serial):
+    """Returns a read(timeout) function that polls the serial device's
+    in_waiting count, for devices without a file descriptor
+    """
+
+    def read(timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            waiting = serial.in_waiting
+            if waiting:
+                return serial.read(waiting)
+            if time.monotonic() >= deadline:
+                return b""
+            time.sleep(POLL_INTERVAL)
+
+    return read
+
+
+def _pop_frames(rxbuf: bytearray):
+    """Remove and return the complete, zero-terminated frames from rxbuf
+
+    Incomplete frames remain in rxbuf.
+    """
+    frames = []
+    start = 0
+    end = rxbuf.find(b"\0")
+    while end != -1:
+        frames.append(rxbuf[start : end + 1])
+        start = end + 1
+        end = rxbuf.find(b"\0", start)
+    # Shift the incomplete frame to the front once, not after every frame
+    del rxbuf[:start]
+    return frames
+
+
+def _prime_readings(serial) -> bytearray:
+    """Align the serial stream on a frame boundary
+
+    Flushes the serial input once, then reads until there is a frame that
+    decodes. Invalid frames are discarded from the buffer, not flushed from
+    the device. Returns the bytes that follow the first valid frame, which
+    start on a frame boundary. Raises a TimeoutError if too many frames are
+    invalid.
+    """
+    MAX_RETRIES = 1000
+
+    serial.reset_input_buffer()
+    buffer = bytearray(serial.read(2 * MAX_FRAME_LEN))
+    retries = 0
+    while retries < MAX_RETRIES:
+        # The bytes before the first zero are the tail of a partial frame
+        start = buffer.find(b"\0") + 1
+        end = buffer.find(b"\0", start) if start else -1
+        if end == -1:
+            buffer += serial.read(max(1, serial.in_waiting))
+            continue
+
+        try:
+            motion_sensor.convert_readings(buffer[start : end + 1])
+        except ValueError:
+            del buffer[:start]
+            retries += 1
+            continue
+
+        del buffer[: end + 1]
+        return buffer
+
+    raise TimeoutError(f"Could not find prime readings after {MAX_RETRIES} retries")
+
+
+def _start_frame_reader(serial, rxbuf: bytearray, pop_frames):
+    """Start a thread that reads frames from the serial device
+
+    The thread owns rxbuf. It extends rxbuf with data from the serial device,
+    and puts the frames from pop_frames(rxbuf) on the returned queue. If
+    reading fails, the thread puts the exception on the queue, then stops.
+
+    Call the returned stop() function to stop the thread. stop() returns once
+    the thread has exited, so no later read can take data from the device.
+    """
+    frames = queue.SimpleQueue()
+    stopping = threading.Event()
+    read, close = _serial_reader(serial)
+
+    def reader_loop():
+        try:
+            while not stopping.is_set():
+                for frame in pop_frames(rxbuf):
+                    frames.put(frame)
+                while frames.qsize() > MAX_QUEUED_FRAMES:
+                    try:
+                        frames.get_nowait()
+                    except queue.Empty:
+                        break
+                rxbuf.extend(read(READ_TIMEOUT))
+        except Exception as err:
+            frames.put(err)
+        finally:
+            close()
+
+    thread = threading.Thread(target=reader_loop, daemon=True)
+    thread.start()
+
+    def stop():
+        stopping.set()
+        thread.join()
+
+    return frames, stop
 
 
 class ImuReading:
@@ -16,6 +195,63 @@ class ImuReading:
     Mag = motion_sensor.Mag
 
 
+# The measurement filter bit for each reading type
+_READING_BITS = {
+    ImuReading.Acc: 1 << 0,
+    ImuReading.Gyro: 1 << 1,
+    ImuReading.Mag: 1 << 2,
+}
+
+
+def _stream_arrays(stream, batch: int, into):
+    """Collect the readings from stream() into batches of (acc, gyro, mag)
+    numpy arrays
+
+    See ImuStream.stream_arrays for the behavior of batch and into. Checks
+    the arguments before returning the generator, so that bad arguments
+    raise a ValueError at the call site.
+    """
+    import numpy as np
+
+    if batch < 1:
+        raise ValueError(f"batch must be at least 1, not {batch}")
+    if into is not None:
+        if len(into) != 3:
+            raise ValueError("'into' must hold three arrays: acc, gyro, and mag")
+        for array in into:
+            if not isinstance(array, np.ndarray) or array.dtype != np.float32:
+                raise ValueError("Arrays in 'into' must be float32 numpy arrays")
+            if array.shape != (batch, 3):
+                raise ValueError(f"Arrays in 'into' must have shape ({batch}, 3)")
+        into = tuple(into)
+
+    return _batch_arrays(stream(), batch, into, np)
+
+
+def _batch_arrays(readings, batch: int, into, np):
+    """The generator behind _stream_arrays"""
+
+    def new_arrays():
+        if into is not None:
+            return into
+        return tuple(np.empty((batch, 3), dtype=np.float32) for _ in range(3))
+
+    # Reading type -> index of its array in (acc, gyro, mag)
+    array_index = {reading_type: idx for idx, reading_type in enumerate(_READING_BITS)}
+
+    arrays = new_arrays()
+    counts = [0, 0, 0]
+    for reading in readings:
+        idx = array_index[type(reading)]
+        row = counts[idx]
+        arrays[idx][row] = (reading.x, reading.y, reading.z)
+        counts[idx] = row + 1
+        if row + 1 == batch:
+            yield tuple(array[:count] for array, count in zip(arrays, counts))
+            arrays = new_arrays()
+            counts = [0, 0, 0]
+
+
 class ImuStream:
     """An iterator over the IMU readings"""
 
@@ -29,26 +265,8 @@ class ImuStream:
         The user is responsible for configuring the serial port.
         """
         self._serial = serial
-        self._measurement_filter = {
-            ImuReading.Acc,
-            ImuReading.Gyro,
-            ImuReading.Mag,
-        }
-
-    def _prime_readings(self):
-        MAX_RETRIES = 1000
-
-        retries = 0
-        while retries < MAX_RETRIES:
-            self._serial.reset_input_buffer()
-            buffer = bytearray(self._serial.read_until(b"\0"))
-            try:
-                motion_sensor.convert_readings(buffer)
-                return
-            except ValueError:
-                retries += 1
-
-        raise TimeoutError(f"Could not find prime readings after {MAX_RETRIES} retries")
+        self._measurement_filter = 0
+        self.enable_readings(*_READING_BITS)
 
     def disable_readings(self, *reading_types):
         """Prevent the IMU from streaming certain types of readings
@@ -60,7 +278,7 @@ class ImuStream:
         the embedded system to not poll for that data.
         """
         for reading_type in reading_types:
-            self._measurement_filter.remove(reading_type)
+            self._measurement_filter &= ~_READING_BITS[reading_type]
 
     def enable_readings(self, *reading_types):
         """Tell the IMU to stream certain types of readings
@@ -72,7 +290,7 @@ class ImuStream:
         or it could change a filter on the host.
         """
         for reading_type in reading_types:
-            self._measurement_filter.add(reading_type)
+            self._measurement_filter |= _READING_BITS[reading_type]
 
     def stream(self):
         """Stream IMU readings with an endless generator
@@ -80,11 +298,52 @@ class ImuStream:
         Pass the output of stream() to a for loop, or type that accepts an
         iterator. The generator blocks indefinitely. Raises a TimeoutError
         if the implementation could not prime the IMU data stream.
+
+        A background thread reads frames from the serial device while the
+        generator decodes them. If the caller falls behind, the stream drops
+        the oldest frames.
         """
-        self._prime_readings()
-        while True:
-            buffer = bytearray(self._serial.read_until(b"\0"))
-            readings = motion_sensor.convert_readings(buffer)
-            for reading in readings:
-                if type(reading) in self._measurement_filter:
-                    yield reading
+        rxbuf = _prime_readings(self._serial)
+        frames, stop = _start_frame_reader(self._serial, rxbuf, _pop_frames)
+
+        # Local names skip global and attribute lookups in the loop
+        convert_readings = motion_sensor.convert_readings
+        reading_bits = _READING_BITS
+        next_frame = frames.get
+        _type = type
+
+        try:
+            while True:
+                buffer = next_frame()
+                if isinstance(buffer, Exception):
+                    raise buffer
+
+                # Re-read the filter, since the caller may change it between readings
+                measurement_filter = self._measurement_filter
+                readings = convert_readings(buffer)
+                for reading in readings:
+                    if reading_bits[_type(reading)] & measurement_filter:
+                        yield reading
+        finally:
+            stop()
+
+    def stream_arrays(self, batch: int = 256, into=None):
+        """Stream IMU readings as batches of numpy arrays with an endless
+        generator
+
+        Yields (acc, gyro, mag) tuples of float32 arrays shaped (N, 3). Each
+        row is a reading's x, y, z values. A tuple is yielded as soon as one
+        array has `batch` rows. The other arrays hold the readings that arrived
+        in the meantime, and disabled readings have zero rows.
+
+        By default, each batch has new arrays. To avoid allocations, pass a
+        tuple of three (batch, 3) float32 arrays as `into`. The yielded arrays
+        are then views of `into`, so use each batch before the next one.
+
+        Raises a ValueError if batch is less than 1, or if `into` doesn't
+        match that description.
+
+        stream_arrays depends on numpy being installed in your Python
+        environment.
+        """
+        return _stream_arrays(self.stream, batch, into)
@@ -12,22 +12,34 @@ Usage:
     # Set motor "A" to 37% throttle
     pwm_control.motor("A").set_throttle(37)
 
+    # Set motors "A" and "B" with a single serial write
+    pwm_control.set_throttles({"A": 37, "B": 42})
+
 Notes:
 
     Motor constructor should be considered private. Do not use.
     Use PwmControl methods to acquire the motor objects.
 """
 
+from typing import Dict
+
 
 class Motor:
     """A handle to a single motor"""
 
+    __slots__ = ("_motor_id", "_serial", "_cmd_format")
+
     def __init__(self, motor_id: str, serial):
         self._motor_id = motor_id
         self._serial = serial
+        # Command format, like b"A.%.3f\r"
+        self._cmd_format = f"{motor_id}.%.3f\r".encode("ASCII")
 
-    def _encode(self, pct: float):
-        return bytes(f"{self._motor_id}.{pct}\r".encode("ASCII"))
+    def _encode(self, pct: float) -> bytes:
+        if 0.0 <= pct <= 100:
+            return self._cmd_format % pct
+        else:
+            raise ValueError(f"Invalid motor throttle percentage: {pct}")
 
     def set_throttle(self, pct: float):
         """Set the motor throttle as a percentage between 0 and 100
@@ -38,18 +50,18 @@ class Motor:
         Returns Nothing on success.
         """
 
-        if 0.0 <= pct <= 100:
-            cmd = self._encode(pct)
-            self._serial.write(cmd)
-        else:
-            raise ValueError(f"Invalid motor throttle percentage: {pct}")
+        cmd = self._encode(pct)
+        self._serial.write(cmd)
 
 
 class PwmControl:
     """The PWM motors that interface the pwm-control's ESC"""
 
+    __slots__ = ("_serial", "_motors")
+
     def __init__(self, serial):
         self._serial = serial
+        self._motors = {motor_id: Motor(motor_id, serial) for motor_id in "ABCD"}
 
     def motor(self, motor_id: str):
         """Get a handle to the motor identified by the motor_id string
@@ -57,8 +69,26 @@ class PwmControl:
         Returns nothing is the motor ID is invalid. See the pwm-control
         documentation to understand valid motor IDs.
         """
-        if motor_id in {"A", "B", "C", "D"}:
-            return Motor(motor_id, self._serial)
+        return self._motors.get(motor_id)
+
+    def set_throttles(self, throttles: Dict[str, float]):
+        """Set the throttles of many motors with a single serial write
+
+        throttles maps motor IDs to percentages between 0 and 100.
+
+        Throws a ValueError if a motor ID or percentage is not valid. In that
+        case, no throttles are set. May also throw an error when writing to
+        the serial device.
+        """
+        cmds = []
+        for motor_id, pct in throttles.items():
+            motor = self._motors.get(motor_id)
+            if motor is None:
+                raise ValueError(f"Invalid motor ID: {motor_id}")
+            cmds.append(motor._encode(pct))
+
+        if cmds:
+            self._serial.write(b"".join(cmds))
 
     def reset(self):
         """Reset all throttles to zero percent
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""Install the pypwm_control package
+
+    pip install host/
+
+pyproject.toml provides Cython, so setup compiles the optional ImuStreamC
+extension. If Cython isn't available, or the extension doesn't compile (for
+instance, there's no C compiler), setup installs the pure Python package.
+"""
+
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+import logging
+
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(["pypwm_control/_imu_stream.pyx"])
+except ImportError:
+    ext_modules = []
+
+BUILD_ERRORS = (CCompilerError, ExecError, PlatformError, OSError)
+
+
+class optional_build_ext(build_ext):
+    """Builds extensions, but lets the install continue without them"""
+
+    def run(self):
+        try:
+            super().run()
+        except BUILD_ERRORS as err:
+            logging.warning("Skipping optional extensions: %s", err)
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except BUILD_ERRORS as err:
+            logging.warning("Skipping optional extension %s: %s", ext.name, err)
+
+
+setup(
+    name="pypwm_control",
+    version="0.1.0",
+    packages=["pypwm_control"],
+    install_requires=["pyserial"],
+    # Only needed when the pymotion-sensor library isn't installed
+    extras_require={"numba": ["numba", "numpy"]},
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": optional_build_ext},
+)
@@ -25,14 +25,16 @@ Run arbitrary tasks in the repo
 """
 
 import argparse
+import functools
 import logging
 import os
 import pathlib
 import subprocess
 import shutil
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
 RUSTFLAGS = "-C link-arg=-Tt4link.x"
 TARGET = "thumbv7em-none-eabihf"
@@ -45,6 +47,14 @@ DEMOS = [
 ]
 
 
+@functools.lru_cache(maxsize=1)
+def _teensy_loader() -> Optional[str]:
+    """Returns the path to the command-line Teensy loader, or None
+    if it isn't installed
+    """
+    return shutil.which(TEENSY_LOADER)
+
+
 def _flash(program: pathlib.Path) -> bool:
     """Calls the command-line Teensy loader to flash the program.
 
@@ -52,10 +62,11 @@ def _flash(program: pathlib.Path) -> bool:
     a flashing error.
     """
 
-    if shutil.which(TEENSY_LOADER):
-        cmd = f"{TEENSY_LOADER} --mcu=TEENSY40 -w -v {program}"
-        logging.debug("Found %s, running '%s'", TEENSY_LOADER, cmd)
-        subprocess.run(cmd, shell=True, check=True)
+    teensy_loader = _teensy_loader()
+    if teensy_loader:
+        cmd = [teensy_loader, "--mcu=TEENSY40", "-w", "-v", str(program)]
+        logging.debug("Found %s, running '%s'", TEENSY_LOADER, " ".join(cmd))
+        subprocess.run(cmd, check=True)
         return True
 
     else:
@@ -68,9 +79,9 @@ def _bin2hex(binary: pathlib.Path) -> pathlib.Path:
     """
 
     hex_file = binary.with_suffix(".hex")
-    cmd = f"{OBJCOPY} -O ihex -R .eeprom {binary} {hex_file}"
-    logging.debug("Running '%s'", cmd)
-    subprocess.run(cmd, shell=True, check=True)
+    cmd = [OBJCOPY, "-O", "ihex", "-R", ".eeprom", str(binary), str(hex_file)]
+    logging.debug("Running '%s'", " ".join(cmd))
+    subprocess.run(cmd, check=True)
     logging.debug("Created hex file at '%s'", hex_file)
     return hex_file
 
@@ -82,23 +93,21 @@ def _cargo_build(workspace: str, binary: Optional[str], release: bool) -> pathli
     in that workspace. If `release` is True, build a release build.
     """
 
-    mode = ""
+    cmd = ["cargo", "build", "--manifest-path", f"{workspace}/Cargo.toml"]
     if release:
-        mode = "--release"
-
-    cmd = f"cargo build {mode} --manifest-path {workspace}/Cargo.toml"
+        cmd.append("--release")
 
     env = os.environ.copy()
     if "firmware" == workspace:
         env["RUSTFLAGS"] = RUSTFLAGS
-        cmd += f" --target {TARGET}"
+        cmd += ["--target", TARGET]
         logging.debug("Extended environment with RUSTFLAGS='%s'", RUSTFLAGS)
 
     if binary:
-        cmd += f" --bin {binary}"
+        cmd += ["--bin", binary]
 
-    logging.debug("Running '%s'", cmd)
-    subprocess.run(cmd, shell=True, check=True, env=env)
+    logging.debug("Running '%s'", " ".join(cmd))
+    subprocess.run(cmd, check=True, env=env)
 
     target_dir = (
         pathlib.Path(workspace)
@@ -128,9 +137,12 @@ def release(args):
     logging.debug("Building workspace...")
     target = _cargo_build("firmware", None, True)
     logging.debug("Converting all demos %s to hex files...", DEMOS)
-    hex_files = [_bin2hex(target / demo) for demo in DEMOS]
+    # objcopy runs in a subprocess, so threads convert the demos in parallel
+    with ThreadPoolExecutor(max_workers=len(DEMOS)) as executor:
+        hex_files = list(executor.map(_bin2hex, [target / demo for demo in DEMOS]))
     demos_name = target / "demos.zip"
-    with ZipFile(demos_name, "w") as demo_zip:
+    # Hex files are ASCII, so even the fastest compression level shrinks them
+    with ZipFile(demos_name, "w", ZIP_DEFLATED, compresslevel=1) as demo_zip:
         for hex_file in hex_files:
             logging.debug("Adding %s to zip file...", hex_file)
             demo_zip.write(hex_file, hex_file.name)